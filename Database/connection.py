@@ -4,9 +4,10 @@ import logging
 from config.settings import DB_HOST, DB_NAME, DB_USER, DB_PASSWORD, DB_PORT
 
 # -- Database Connection -- #
-def get_db_connection():
+def get_db_connection(connection_factory=None):
     """
     Establishes a connection to the PostgreSQL database.
+    Pass connection_factory to use a custom connection class (e.g. for profiling).
     """
     try:
         conn = pg.connect(
@@ -14,7 +15,8 @@ def get_db_connection():
             dbname=DB_NAME,
             user=DB_USER,
             password=DB_PASSWORD,
-            port=DB_PORT
+            port=DB_PORT,
+            connection_factory=connection_factory
         )
         logging.info("Database connection established.")
         return conn
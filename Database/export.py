@@ -0,0 +1,318 @@
+import psycopg2 as pg
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+
+# --- Denormalized Country Documents --- #
+
+# Builds every document in one set-based statement: the junction tables are
+# aggregated once per table (not once per country) and joined back to country.
+# Rows are only rewritten when the freshly built document differs from the
+# stored one, so unchanged countries keep their updated_at.
+refresh_documents_query = """
+WITH currencies AS (
+    SELECT cc.country_id,
+           jsonb_agg(jsonb_build_object('code', cur.code, 'name', cur.name, 'symbol', cur.symbol)
+                     ORDER BY cur.code) AS currencies
+    FROM country_currency cc
+    JOIN currency cur ON cur.id = cc.currency_id
+    GROUP BY cc.country_id
+),
+languages AS (
+    SELECT cl.country_id,
+           jsonb_agg(jsonb_build_object('code', l.code, 'name', l.name)
+                     ORDER BY l.code) AS languages
+    FROM country_language cl
+    JOIN language l ON l.id = cl.language_id
+    GROUP BY cl.country_id
+)
+INSERT INTO country_document (country_id, cca2, document)
+SELECT
+    c.id,
+    c.cca2,
+    jsonb_build_object(
+        'cca2', c.cca2,
+        'name', c.name,
+        'capital', c.capital,
+        'region', c.region,
+        'subregion', c.subregion,
+        'population', c.population,
+        'area', c.area,
+        'currencies', COALESCE(cur.currencies, '[]'::jsonb),
+        'languages', COALESCE(lang.languages, '[]'::jsonb)
+    )
+FROM country c
+LEFT JOIN currencies cur ON cur.country_id = c.id
+LEFT JOIN languages lang ON lang.country_id = c.id
+WHERE %(codes)s::text[] IS NULL OR c.cca2 = ANY(%(codes)s::text[])
+ON CONFLICT (country_id) DO UPDATE
+SET
+    cca2 = EXCLUDED.cca2,
+    document = EXCLUDED.document,
+    updated_at = now()
+WHERE country_document.document IS DISTINCT FROM EXCLUDED.document;
+"""
+
+
+def refresh_country_documents(conn, cca2_codes=None):
+    """
+    Rebuilds the denormalized country documents in the country_document table.
+    Only countries whose document changed are rewritten. Pass cca2_codes to
+    limit the rebuild to those countries. Returns the number of rewritten rows,
+    or None on a database error.
+    """
+    logging.info("Refreshing country documents...")
+    codes = list(cca2_codes) if cca2_codes is not None else None
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(refresh_documents_query, {'codes': codes})
+        changed = cursor.rowcount
+        conn.commit()
+        logging.info(f"Country documents refreshed. {changed} documents changed.")
+        return changed
+
+    except pg.Error as e:
+        conn.rollback()
+        logging.error(f"Database error while refreshing country documents: {e}")
+        return None
+    finally:
+        cursor.close()
+
+
+# --- File Export --- #
+
+# Index file layout: a header followed by a fixed-size open-addressing hash
+# table. Each slot holds the cca2 key (null padded), and the byte offset and
+# length of the matching line in the NDJSON file. The header records the size
+# of the NDJSON file it was built for, so a mismatched pair is refused.
+INDEX_MAGIC = b'CIDX'
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct('<4sIIQ')  # magic, version, slot count, data size
+INDEX_SLOT = struct.Struct('<4sQI')    # cca2, offset, length
+EMPTY_KEY = b'\x00' * 4
+
+
+def _index_key(cca2):
+    key = cca2.encode('ascii')
+    if not key or len(key) > 4:
+        raise ValueError(f"Invalid cca2 for index: {cca2!r}")
+    return key.ljust(4, b'\x00')
+
+
+def _slot_count(n):
+    # Power of two with a load factor of at most 0.5 keeps probe chains short
+    size = 8
+    while size < n * 2:
+        size *= 2
+    return size
+
+
+def _write_index(index_path, entries, data_size):
+    """
+    Writes the hash index for the (cca2, offset, length) entries of an NDJSON
+    file of data_size bytes.
+    """
+    slots = _slot_count(len(entries))
+    table = [None] * slots
+    for cca2, offset, length in entries:
+        key = _index_key(cca2)
+        pos = zlib.crc32(key) & (slots - 1)
+        while table[pos] is not None:
+            pos = (pos + 1) & (slots - 1)
+        table[pos] = (key, offset, length)
+
+    with open(index_path, 'wb') as index_file:
+        index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, slots, data_size))
+        for slot in table:
+            index_file.write(INDEX_SLOT.pack(*slot) if slot else INDEX_SLOT.pack(EMPTY_KEY, 0, 0))
+
+
+def write_document_files(documents, ndjson_path, index_path):
+    """
+    Writes (cca2, document) pairs to an NDJSON file plus its cca2 hash index.
+    The files are written in place; export_country_documents writes them to a
+    fresh directory and publishes that, so readers never see a partial export.
+    """
+    entries = []
+    offset = 0
+
+    try:
+        with open(ndjson_path, 'wb') as ndjson_file:
+            for cca2, document in documents:
+                line = (json.dumps(document, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+                ndjson_file.write(line)
+                entries.append((cca2, offset, len(line)))
+                offset += len(line)
+
+        _write_index(index_path, entries, offset)
+    except Exception:
+        # Drop the partial files
+        for path in (ndjson_path, index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return len(entries)
+
+
+# Each export goes to its own export-* directory. The CURRENT_LINK symlink is
+# swapped to it in one os.replace, so the NDJSON file and its index always
+# change together. The previous export is kept for readers that resolved the
+# link just before the swap; older ones are removed.
+CURRENT_LINK = 'current'
+EXPORT_PREFIX = 'export-'
+
+
+def _publish_export(export_dir, version_dir):
+    link_path = os.path.join(export_dir, CURRENT_LINK)
+    previous = os.readlink(link_path) if os.path.islink(link_path) else None
+
+    tmp_link = link_path + '.tmp'
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(os.path.basename(version_dir), tmp_link)
+    os.replace(tmp_link, link_path)
+
+    keep = {os.path.basename(version_dir), previous}
+    for name in os.listdir(export_dir):
+        path = os.path.join(export_dir, name)
+        if name.startswith(EXPORT_PREFIX) and name not in keep and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def export_country_documents(conn, export_dir):
+    """
+    Dumps the country_document table to countries.ndjson and countries.idx in
+    a new directory under export_dir, then points export_dir/current at it.
+    Returns the number of exported documents, or None on error.
+    """
+    logging.info(f"Exporting country documents to {export_dir}...")
+    cursor = conn.cursor()
+    version_dir = None
+
+    try:
+        os.makedirs(export_dir, exist_ok=True)
+        cursor.execute("SELECT cca2, document FROM country_document ORDER BY cca2")
+        version_dir = tempfile.mkdtemp(prefix=EXPORT_PREFIX, dir=export_dir)
+        count = write_document_files(
+            cursor.fetchall(),
+            os.path.join(version_dir, 'countries.ndjson'),
+            os.path.join(version_dir, 'countries.idx')
+        )
+        _publish_export(export_dir, version_dir)
+        logging.info(f"Exported {count} country documents to {version_dir}.")
+        return count
+
+    except (pg.Error, OSError, ValueError) as e:
+        # ValueError: a cca2 that cannot be stored in the index (non-ASCII or too long)
+        logging.error(f"Error exporting country documents: {e}")
+        # Leave the published export untouched
+        if version_dir is not None:
+            shutil.rmtree(version_dir, ignore_errors=True)
+        return None
+    finally:
+        cursor.close()
+
+
+# --- Lookup --- #
+
+class CountryDocumentIndex:
+    """
+    Read-only lookup of exported country documents by cca2. Both the NDJSON
+    file and its index are memory-mapped, so a lookup is one hash probe plus
+    one slice of the data file.
+    """
+
+    def __init__(self, ndjson_path, index_path):
+        self._files = []
+        self._data = self._map(ndjson_path)
+        self._index = self._map(index_path)
+
+        if len(self._index) < INDEX_HEADER.size:
+            self.close()
+            raise ValueError(f"Not a country document index: {index_path}")
+        magic, version, slots, data_size = INDEX_HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Not a country document index: {index_path}")
+        if data_size != len(self._data):
+            self.close()
+            raise ValueError(f"{index_path} was not built for {ndjson_path}")
+        self._slots = slots
+
+    @classmethod
+    def from_dir(cls, export_dir):
+        """
+        Opens the export export_dir/current points at. The link is resolved
+        once, so both files come from the same export.
+        """
+        current = os.path.realpath(os.path.join(export_dir, CURRENT_LINK))
+        return cls(os.path.join(current, 'countries.ndjson'), os.path.join(current, 'countries.idx'))
+
+    def _map(self, path):
+        handle = open(path, 'rb')
+        self._files.append(handle)
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _find(self, cca2):
+        try:
+            key = _index_key(cca2)
+        except (ValueError, UnicodeEncodeError):
+            return None
+
+        mask = self._slots - 1
+        pos = zlib.crc32(key) & mask
+        for _ in range(self._slots):
+            slot_key, offset, length = INDEX_SLOT.unpack_from(self._index, INDEX_HEADER.size + pos * INDEX_SLOT.size)
+            if slot_key == key:
+                return offset, length
+            if slot_key == EMPTY_KEY:
+                return None
+            pos = (pos + 1) & mask
+        return None
+
+    def get(self, cca2, default=None):
+        """
+        Returns the document for cca2, or default if it is not in the export.
+        Raises ValueError if the index points at another country's document.
+        """
+        found = self._find(cca2)
+        if found is None:
+            return default
+        offset, length = found
+        document = json.loads(self._data[offset:offset + length])
+        if document.get('cca2') != cca2:
+            raise ValueError(f"Index entry for {cca2!r} points at the document for {document.get('cca2')!r}")
+        return document
+
+    def __contains__(self, cca2):
+        return self._find(cca2) is not None
+
+    def __getitem__(self, cca2):
+        found = self.get(cca2)
+        if found is None:
+            raise KeyError(cca2)
+        return found
+
+    def close(self):
+        for mapped in (getattr(self, '_data', None), getattr(self, '_index', None)):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for handle in self._files:
+            handle.close()
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,306 @@
+import psycopg2 as pg
+from psycopg2.extensions import connection as pg_connection, cursor as pg_cursor, ISOLATION_LEVEL_AUTOCOMMIT
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+# --- Load Profiling --- #
+#
+# Opt-in instrumentation for the load path. Open the load connection with
+# get_db_connection(connection_factory=ProfilingConnection) and wrap the load
+# in a LoadProfiler; every cursor of that connection then counts its executes,
+# round trips, bytes and client time per SQL template, while a second
+# connection samples pg_stat_activity/pg_locks for the loading backend.
+
+
+def normalize_sql(query):
+    """
+    Reduces a statement to its template: -- and /* */ comments dropped,
+    whitespace collapsed, parameters (%s, %(name)s, $1) replaced by '?' and
+    parenthesised parameter lists collapsed to a single '?'. The last step
+    makes a client template such as 'IN %s' match the 'IN ($1, $2)' that
+    pg_stat_statements records once psycopg2 has expanded the tuple, or the
+    'IN ($1 /*, ... */)' newer versions record for long lists.
+    """
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    query = re.sub(r'/\*.*?\*/', ' ', query, flags=re.DOTALL)
+    query = re.sub(r'--[^\n]*', ' ', query)
+    query = re.sub(r'%\(\w+\)s|%s|\$\d+', '?', query)
+    query = re.sub(r'\(\s*\?(\s*,\s*\?)*\s*\)', '?', query)
+    return re.sub(r'\s+', ' ', query).strip().rstrip(';').strip()
+
+
+def sql_table(template):
+    """
+    Returns the table a statement template writes to or reads from first.
+    """
+    match = re.search(r'\b(?:INSERT INTO|UPDATE|DELETE FROM|FROM)\s+(\w+)', template, re.IGNORECASE)
+    return match.group(1) if match else 'other'
+
+
+def _new_stats():
+    return {'executes': 0, 'round_trips': 0, 'rows': 0, 'bytes': 0,
+            'client_time': 0.0, 'server_time': None, 'samples': 0, 'waits': Counter()}
+
+
+class ProfilingCursor(pg_cursor):
+    """
+    Cursor that records every execute/executemany in its connection's profile.
+    """
+
+    def _record(self, query, round_trips, sent, elapsed):
+        profile = self.connection.profile
+        stats = profile.setdefault(normalize_sql(query), _new_stats())
+        stats['executes'] += 1
+        stats['round_trips'] += round_trips
+        stats['rows'] += max(self.rowcount, 0)
+        stats['bytes'] += sent
+        stats['client_time'] += elapsed
+
+    def execute(self, query, vars=None):
+        self.connection.current_template = query
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.connection.current_template = None
+            self._record(query, 1, len(self.query or b''), elapsed)
+
+    def executemany(self, query, vars_list):
+        # psycopg2 sends one statement per parameter set. Only a successful
+        # call is recorded: after a failure it is unknown how many were sent,
+        # and mogrify could raise over the original error.
+        vars_list = list(vars_list)
+        self.connection.current_template = query
+        start = time.perf_counter()
+        try:
+            result = super().executemany(query, vars_list)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.connection.current_template = None
+        sent = sum(len(self.mogrify(query, v)) for v in vars_list)
+        self._record(query, len(vars_list), sent, elapsed)
+        return result
+
+
+class ProfilingConnection(pg_connection):
+    """
+    Connection whose cursors are ProfilingCursors. profile maps each SQL
+    template to its counters.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = {}
+        self.current_template = None
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault('cursor_factory', ProfilingCursor)
+        return super().cursor(*args, **kwargs)
+
+    def _timed(self, label, call):
+        self.current_template = label
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            stats = self.profile.setdefault(label, _new_stats())
+            stats['executes'] += 1
+            stats['round_trips'] += 1
+            stats['client_time'] += time.perf_counter() - start
+            self.current_template = None
+
+    def commit(self):
+        return self._timed('COMMIT', super().commit)
+
+    def rollback(self):
+        return self._timed('ROLLBACK', super().rollback)
+
+
+class LoadProfiler:
+    """
+    Profiles everything run on a ProfilingConnection inside the with block.
+
+    sampler_connect returns a separate connection used to poll the loading
+    backend in pg_stat_activity and pg_locks every interval seconds. Server
+    time per template comes from pg_stat_statements when that extension is
+    installed; without it server time is reported as n/a.
+    """
+
+    activity_query = """
+        SELECT a.wait_event_type, a.wait_event,
+               (SELECT count(*) FROM pg_locks l WHERE l.pid = a.pid AND NOT l.granted)
+        FROM pg_stat_activity a
+        WHERE a.pid = %s
+    """
+
+    def __init__(self, conn, sampler_connect=None, interval=0.005, label='insert_data_to_db'):
+        if not isinstance(conn, ProfilingConnection):
+            raise TypeError("LoadProfiler needs a connection opened with connection_factory=ProfilingConnection")
+        self.conn = conn
+        self.sampler_connect = sampler_connect
+        self.interval = interval
+        self.label = label
+        self.samples = 0
+        self.lock_waits = 0
+        self.wall_time = 0.0
+        self._sampler_conn = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._statements_before = None
+
+    # --- Sampling --- #
+
+    def _open_sampler(self):
+        if self.sampler_connect is None:
+            return
+        try:
+            self._sampler_conn = self.sampler_connect()
+        except pg.Error as e:
+            logging.warning(f"Load profiler could not open a sampling connection: {e}")
+            return
+        if self._sampler_conn is not None:
+            self._sampler_conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+    def _sample(self, pid):
+        cursor = self._sampler_conn.cursor()
+        try:
+            while not self._stop.wait(self.interval):
+                template = self.conn.current_template
+                cursor.execute(self.activity_query, (pid,))
+                row = cursor.fetchone()
+                if not row or template is None:
+                    continue
+                wait_event_type, wait_event, blocked = row
+                self.samples += 1
+                stats = self.conn.profile.setdefault(normalize_sql(template), _new_stats())
+                stats['samples'] += 1
+                if wait_event_type:
+                    stats['waits'][f"{wait_event_type}:{wait_event}"] += 1
+                if blocked:
+                    self.lock_waits += 1
+        except pg.Error as e:
+            logging.warning(f"Load profiler stopped sampling: {e}")
+        finally:
+            cursor.close()
+
+    def _statement_times(self):
+        # {template: total server ms} from pg_stat_statements, or None if unavailable
+        if self._sampler_conn is None:
+            return None
+        cursor = self._sampler_conn.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+            if not cursor.fetchone():
+                return None
+            cursor.execute("""
+                SELECT query, total_exec_time FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+            """)
+            times = Counter()
+            for query, total in cursor.fetchall():
+                times[normalize_sql(query)] += total
+            return times
+        except pg.Error as e:
+            logging.warning(f"Load profiler could not read pg_stat_statements: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def __enter__(self):
+        self.conn.profile = {}
+        self._open_sampler()
+        self._statements_before = self._statement_times()
+        if self._sampler_conn is not None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample, args=(self.conn.get_backend_pid(),), daemon=True)
+            self._thread.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_time = time.perf_counter() - self._start
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        after = self._statement_times()
+        if self._statements_before is not None and after is not None:
+            for template, stats in self.conn.profile.items():
+                if template in after:
+                    stats['server_time'] = (after[template] - self._statements_before.get(template, 0)) / 1000
+
+        if self._sampler_conn is not None:
+            self._sampler_conn.close()
+            self._sampler_conn = None
+
+    # --- Reporting --- #
+
+    def totals(self):
+        profile = self.conn.profile
+        return {
+            'executes': sum(s['executes'] for s in profile.values()),
+            'round_trips': sum(s['round_trips'] for s in profile.values()),
+            'bytes': sum(s['bytes'] for s in profile.values()),
+            'client_time': sum(s['client_time'] for s in profile.values()),
+            'lock_waits': self.lock_waits,
+            'samples': self.samples,
+            'wall_time': self.wall_time,
+        }
+
+    def folded(self):
+        """
+        Returns the profile as folded stacks (run;table;template weight), with
+        the weight in microseconds of client time, ready for flamegraph tools.
+        Sampled wait events become child frames of their template, weighted
+        by their share of that template's samples.
+        """
+        lines = []
+        for template, stats in self.conn.profile.items():
+            frame = f"{self.label};{sql_table(template)};{template[:80].replace(';', ',')}"
+            per_sample = stats['client_time'] / stats['samples'] if stats['samples'] else 0
+            waited = sum(stats['waits'].values()) * per_sample
+            lines.append(f"{frame} {int((stats['client_time'] - waited) * 1e6)}")
+            for event, count in stats['waits'].items():
+                lines.append(f"{frame};{event} {int(count * per_sample * 1e6)}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """
+        Returns a per-table, per-template text report sorted by client time.
+        """
+        totals = self.totals()
+        by_table = {}
+        for template, stats in self.conn.profile.items():
+            by_table.setdefault(sql_table(template), []).append((template, stats))
+
+        def table_time(item):
+            return sum(stats['client_time'] for _, stats in item[1])
+
+        lines = [
+            f"{self.label}: {totals['wall_time'] * 1e3:.1f} ms wall, {totals['executes']} executes, "
+            f"{totals['round_trips']} round trips, {totals['bytes']} bytes sent, "
+            f"{totals['lock_waits']} lock-wait samples of {totals['samples']}"
+        ]
+        for table, templates in sorted(by_table.items(), key=table_time, reverse=True):
+            share = table_time((table, templates)) / totals['client_time'] * 100 if totals['client_time'] else 0
+            lines.append(f"  {table:<20}{table_time((table, templates)) * 1e3:>10.1f} ms  {share:5.1f}%")
+            for template, stats in sorted(templates, key=lambda t: t[1]['client_time'], reverse=True):
+                server = f"{stats['server_time'] * 1e3:.1f} ms" if stats['server_time'] is not None else 'n/a'
+                waits = ', '.join(f"{event} x{count}" for event, count in stats['waits'].most_common(3))
+                lines.append(
+                    f"    {stats['round_trips']:>6} trips {stats['bytes']:>9} B "
+                    f"client {stats['client_time'] * 1e3:8.1f} ms server {server:>10}  {template[:70]}"
+                    + (f"  [{waits}]" if waits else '')
+                )
+        return '\n'.join(lines)
+
+    def write(self, folded_path):
+        with open(folded_path, 'w', encoding='utf-8') as folded_file:
+            folded_file.write(self.folded())
+        logging.info(f"Load profile written to {folded_path}")
@@ -0,0 +1,64 @@
+"""
+Benchmarks insert_data_to_db against the production schema.
+
+    python -m benchmarks.bench_load --countries 250 --runs 8 --workers 4
+
+Uses the test harness (tests/pg_harness.py): one throwaway server with a
+template database, and one cloned database per run, so runs never see each
+other's rows and can load in parallel.
+"""
+import argparse
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from etl.transform import transform_country_data
+from Database.load import insert_data_to_db
+from benchmarks.bench_query import synthetic_countries
+from tests.pg_harness import PostgresHarness
+
+
+def _load_once(params, dbname, transformed):
+    import psycopg2 as pg
+
+    conn = pg.connect(dbname=dbname, **params)
+    try:
+        start = time.perf_counter()
+        insert_data_to_db(conn, transformed)
+        return time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--countries', type=int, default=250)
+    parser.add_argument('--runs', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    transformed = transform_country_data(synthetic_countries(args.countries))
+
+    with PostgresHarness(suffix='_bench') as harness:
+        start = time.perf_counter()
+        databases = [harness.clone() for _ in range(args.runs)]
+        clone_time = (time.perf_counter() - start) / args.runs
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            timings = list(pool.map(_load_once, [harness.params] * args.runs, databases, [transformed] * args.runs))
+        wall = time.perf_counter() - start
+
+        for dbname in databases:
+            harness.drop(dbname)
+
+    timings.sort()
+    print(f"clone: {clone_time * 1e3:.1f} ms per database")
+    print(f"insert_data_to_db ({args.countries} countries, {args.runs} runs, {args.workers} workers): "
+          f"min {timings[0] * 1e3:.1f} ms, median {timings[len(timings) // 2] * 1e3:.1f} ms, "
+          f"max {timings[-1] * 1e3:.1f} ms, wall {wall:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
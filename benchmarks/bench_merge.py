@@ -0,0 +1,67 @@
+"""
+Benchmarks merge_sources on generated feeds.
+
+    python -m benchmarks.bench_merge --records 3000000 --keys 20000 --sources 3
+
+Records are generated lazily, so peak memory reflects the merge state (one
+entry per unique cca2), not the size of the input. The reported time includes
+generating the records.
+"""
+import argparse
+import random
+import resource
+import time
+
+from etl.merge import merge_sources
+
+REGIONS = ['Africa', 'Americas', 'Asia', 'Europe', 'Oceania']
+
+
+def _key(i):
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    return letters[i % 36] + letters[i // 36 % 36] + letters[i // 1296 % 36]
+
+
+def generated_records(count, keys, seed):
+    """
+    Yields count flat records spread over the given number of unique keys,
+    with some fields missing so precedence rules have gaps to fill.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        k = rng.randrange(keys)
+        yield {
+            'cca2': _key(k),
+            'name': f'Country {k}' if rng.random() > 0.1 else None,
+            'capital': f'Capital {k}' if rng.random() > 0.3 else None,
+            'region': REGIONS[k % len(REGIONS)],
+            'subregion': None,
+            'population': rng.randint(1000, 10 ** 9) if rng.random() > 0.2 else None,
+            'area': rng.uniform(1, 10 ** 7),
+            'currencies': {f'C{k % 160:03d}': {'name': f'Currency {k % 160}', 'symbol': None}},
+            'languages': {f'l{k % 200:03d}': f'Language {k % 200}'},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=1000000, help='records per source')
+    parser.add_argument('--keys', type=int, default=20000, help='unique cca2 keys (at most 46656)')
+    parser.add_argument('--sources', type=int, default=3)
+    args = parser.parse_args()
+
+    sources = [(f'source{i}', generated_records(args.records, args.keys, seed=i)) for i in range(args.sources)]
+    precedence = {'population': [f'source{args.sources - 1}']}
+
+    start = time.perf_counter()
+    merged = merge_sources(sources, precedence)
+    elapsed = time.perf_counter() - start
+
+    total = args.records * args.sources
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"merged {total} records into {len(merged)} countries in {elapsed:.2f} s "
+          f"({total / elapsed:,.0f} records/s), peak RSS {peak_mb:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
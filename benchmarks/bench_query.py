@@ -0,0 +1,144 @@
+"""
+Compares the in-process CountryIndex with the SQL path for the queries in
+SQL/query.sql.
+
+    python -m benchmarks.bench_query            # synthetic data, index only
+    python -m benchmarks.bench_query --sql      # also time the same queries in Postgres
+
+For the SQL timings the same generated data is loaded with insert_data_to_db
+into a throwaway database from the test harness (tests/pg_harness.py), so both
+columns measure the same dataset.
+"""
+import argparse
+import random
+import time
+
+from etl.transform import transform_country_data
+from etl.query import CountryIndex
+
+REGIONS = ['Africa', 'Americas', 'Asia', 'Europe', 'Oceania', 'Antarctic']
+
+# Codes are at most three letters (country.cca2 is VARCHAR(3))
+MAX_COUNTRIES = 26 ** 3
+
+SQL_QUERIES = {
+    'large_countries': """
+        SELECT name, population FROM country
+        WHERE region = 'Asia' AND population > 100000000
+    """,
+    'currencies_in_region': """
+        SELECT DISTINCT cur.name, cur.symbol
+        FROM currency cur
+        JOIN country_currency cc ON cur.id = cc.currency_id
+        JOIN country c ON cc.country_id = c.id
+        WHERE c.region = 'Europe'
+    """,
+    'multi_currency_countries': """
+        SELECT c.name, c.region, COUNT(*) AS no_of_currencies
+        FROM country c
+        JOIN country_currency cc ON c.id = cc.country_id
+        GROUP BY c.id
+        HAVING COUNT(*) > 1
+    """,
+    'filter_group_by': """
+        SELECT l.code, SUM(c.population)
+        FROM country c
+        JOIN country_language cl ON cl.country_id = c.id
+        JOIN language l ON l.id = cl.language_id
+        WHERE c.region = 'Europe' AND c.population > 1000000
+        GROUP BY l.code
+    """,
+}
+
+
+def synthetic_countries(n, seed=0):
+    """
+    Generates n restcountries-shaped records, n at most MAX_COUNTRIES.
+    """
+    if n > MAX_COUNTRIES:
+        raise ValueError(f"At most {MAX_COUNTRIES} synthetic countries, got {n}")
+    rng = random.Random(seed)
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    raw = []
+    for i in range(n):
+        cca2 = letters[i // 26 % 26] + letters[i % 26] + (letters[i // 676] if i >= 676 else '')
+        region = rng.choice(REGIONS)
+        raw.append({
+            'cca2': cca2,
+            'name': {'common': f'Country {cca2}'},
+            'capital': [f'Capital {cca2}'],
+            'region': region,
+            'subregion': f'{region} {rng.randint(1, 4)}',
+            'population': rng.randint(1000, 1500000000),
+            'area': rng.uniform(1, 17000000),
+            'currencies': {f'C{rng.randint(0, 150):03d}': {'name': 'Currency', 'symbol': '$'} for _ in range(rng.randint(1, 3))},
+            'languages': {f'l{rng.randint(0, 200):03d}': 'Language' for _ in range(rng.randint(1, 4))},
+        })
+    return raw
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_sql(transformed, repeat):
+    """
+    Loads transformed into a fresh database and times SQL_QUERIES on it.
+    """
+    from Database.load import insert_data_to_db
+    from tests.pg_harness import PostgresHarness
+
+    times = {}
+    with PostgresHarness(suffix='_bench_query') as harness:
+        dbname = harness.clone()
+        conn = harness.connect(dbname)
+        try:
+            insert_data_to_db(conn, transformed)
+            with conn.cursor() as cursor:
+                cursor.execute("ANALYZE")
+                for name, query in SQL_QUERIES.items():
+                    times[name] = timed(lambda: (cursor.execute(query), cursor.fetchall()), repeat)
+        finally:
+            conn.close()
+            harness.drop(dbname)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--countries', type=int, default=250)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--sql', action='store_true', help='also time the queries against Postgres')
+    args = parser.parse_args()
+    if not 0 < args.countries <= MAX_COUNTRIES:
+        parser.error(f"--countries must be between 1 and {MAX_COUNTRIES}")
+
+    transformed = transform_country_data(synthetic_countries(args.countries))
+    build = timed(lambda: CountryIndex(transformed), 5)
+    index = CountryIndex(transformed)
+    print(f"index build ({args.countries} countries): {build * 1e3:.2f} ms")
+
+    in_process = {
+        'large_countries': index.large_countries,
+        'currencies_in_region': index.currencies_in_region,
+        'multi_currency_countries': index.multi_currency_countries,
+        'filter_group_by': lambda: index.group_by('language', agg='sum', region='Europe', min_population=1000000),
+    }
+
+    sql_times = {}
+    if args.sql:
+        sql_times = time_sql(transformed, args.repeat)
+
+    print(f"{'query':<28}{'index (us)':>12}{'sql (us)':>12}")
+    for name, fn in in_process.items():
+        sql = f"{sql_times[name] * 1e6:.1f}" if name in sql_times else '-'
+        print(f"{name:<28}{timed(fn, args.repeat) * 1e6:>12.1f}{sql:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,4 +10,14 @@ DB_USER = os.getenv('DB_USER', 'user')
 DB_PASSWORD = os.getenv('DB_PASSWORD','password')
 DB_PORT = os.getenv('DB_PORT', '5432')
 
-API_URL = os.getenv('API_URL')
\ No newline at end of file
+API_URL = os.getenv('API_URL')
+
+# -- Validation -- #
+REJECTED_REPORT_PATH = os.getenv('REJECTED_REPORT_PATH', 'artifacts/rejected_rows.csv')
+
+# -- Load Profiling -- #
+LOAD_PROFILE = os.getenv('LOAD_PROFILE', '').lower() in ('1', 'true', 'yes')
+LOAD_PROFILE_PATH = os.getenv('LOAD_PROFILE_PATH', 'artifacts/load_profile.folded')
+
+# -- Export -- #
+EXPORT_DIR = os.getenv('EXPORT_DIR', 'artifacts/export')
\ No newline at end of file
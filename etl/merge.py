@@ -0,0 +1,130 @@
+import logging
+from etl.sources import COUNTRY_FIELDS
+
+# --- Multi-source Merge --- #
+
+SCALAR_FIELDS = COUNTRY_FIELDS[1:]  # everything but the cca2 key
+MERGE_FIELDS = SCALAR_FIELDS + ('currencies', 'languages')
+
+
+def _rank_table(source_names, precedence):
+    """
+    Returns {source: {field: rank}}, lower ranks win. A field listed in
+    precedence ranks its sources in that order, sources it does not list come
+    after them in source order. Unlisted fields use the source order.
+    """
+    precedence = precedence or {}
+    unknown = set(precedence) - set(MERGE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown precedence fields: {sorted(unknown)}")
+    for field, ranking in precedence.items():
+        unknown = set(ranking) - set(source_names)
+        if unknown:
+            raise ValueError(f"Unknown sources in precedence for {field!r}: {sorted(unknown)}")
+
+    order = {name: i for i, name in enumerate(source_names)}
+    ranks = {}
+    for name in source_names:
+        ranks[name] = {}
+        for field in MERGE_FIELDS:
+            ranking = precedence.get(field)
+            if ranking:
+                ranks[name][field] = ranking.index(name) if name in ranking else len(ranking) + order[name]
+            else:
+                ranks[name][field] = order[name]
+    return ranks
+
+
+def _merge_codes(merged, field, codes, rank):
+    # Codes are unioned across sources; each code's details come from the
+    # best-ranked source that has them.
+    current = merged[field]
+    for code, details in codes.items():
+        if not code or details is None:
+            continue
+        if isinstance(details, dict):
+            details = {k: v for k, v in details.items() if v is not None}
+            if code in current and current[code][0] <= rank:
+                # Fill only what the better source is missing
+                current[code][1].update({k: v for k, v in details.items() if k not in current[code][1]})
+                continue
+            if code in current:
+                details = {**current[code][1], **details}
+            current[code] = (rank, details)
+        elif code not in current or current[code][0] > rank:
+            current[code] = (rank, details)
+
+
+def merge_sources(sources, precedence=None):
+    """
+    Merges country records from several sources into one record per cca2.
+
+    sources is a list of (name, records) pairs, where records is any iterable
+    of flat records from etl.sources. They are consumed in a single streaming
+    pass and only one merged entry per unique cca2 is kept in memory.
+
+    For every field the value of the best-ranked source that has one (not
+    None) wins. By default earlier sources rank higher; precedence maps a
+    field to a list of source names to override that, for example
+    {'population': ['internal', 'restcountries']}. Currencies and languages
+    are unioned, with names and symbols picked by the same ranking.
+
+    Returns the merged records in the restcountries shape, so they can be
+    passed straight to transform_country_data.
+    """
+    ranks = _rank_table([name for name, _ in sources], precedence)
+    merged = {}
+    seen = 0
+    skipped = 0
+
+    for name, records in sources:
+        source_ranks = ranks[name]
+        for record in records:
+            seen += 1
+            cca2 = record.get('cca2')
+            cca2 = cca2.strip().upper() if isinstance(cca2, str) else None
+            if not cca2:
+                skipped += 1
+                continue
+
+            entry = merged.get(cca2)
+            if entry is None:
+                entry = merged[cca2] = {'values': {}, 'ranks': {}, 'currencies': {}, 'languages': {}}
+
+            values = entry['values']
+            value_ranks = entry['ranks']
+            for field in SCALAR_FIELDS:
+                value = record.get(field)
+                if value is None:
+                    continue
+                rank = source_ranks[field]
+                if field not in value_ranks or rank < value_ranks[field]:
+                    values[field] = value
+                    value_ranks[field] = rank
+
+            _merge_codes(entry, 'currencies', record.get('currencies') or {}, source_ranks['currencies'])
+            _merge_codes(entry, 'languages', record.get('languages') or {}, source_ranks['languages'])
+
+    if skipped:
+        logging.warning(f"Skipped {skipped} records without a cca2 during merge.")
+    logging.info(f"Merged {seen} records from {len(sources)} sources into {len(merged)} countries.")
+
+    return [_to_restcountries(cca2, entry) for cca2, entry in merged.items()]
+
+
+def _to_restcountries(cca2, entry):
+    values = entry['values']
+    return {
+        'cca2': cca2,
+        'name': {'common': values.get('name')},
+        'capital': [values.get('capital')],
+        'region': values.get('region'),
+        'subregion': values.get('subregion'),
+        'population': values.get('population'),
+        'area': values.get('area'),
+        'currencies': {
+            code: {'name': details.get('name'), 'symbol': details.get('symbol')}
+            for code, (_, details) in entry['currencies'].items()
+        },
+        'languages': {code: name for code, (_, name) in entry['languages'].items()}
+    }
@@ -0,0 +1,172 @@
+import bisect
+import logging
+from collections import defaultdict
+
+# --- In-process Querying --- #
+
+class CountryIndex:
+    """
+    In-memory indexes over the output of transform_country_data, so the
+    questions in SQL/query.sql can be answered without a database.
+
+    Built once in a single pass over the transformed data:
+    - region -> countries
+    - countries sorted by population (for range scans)
+    - currency -> countries and country -> currencies
+    - language -> countries and country -> languages
+    """
+
+    GROUP_FIELDS = ('region', 'subregion', 'currency', 'language')
+    AGGREGATES = ('count', 'sum', 'min', 'max', 'avg')
+    VALUE_FIELDS = ('population', 'area')
+
+    def __init__(self, transformed):
+        self.countries = {c['cca2']: c for c in transformed['countries']}
+        self.currencies = {c['code']: c for c in transformed['currencies']}
+        self.languages = {lang['code']: lang for lang in transformed['languages']}
+
+        self.by_region = defaultdict(list)
+        self.by_subregion = defaultdict(list)
+        for cca2, country in self.countries.items():
+            self.by_region[country['region']].append(cca2)
+            self.by_subregion[country['subregion']].append(cca2)
+
+        # Countries without a population are left out, like NULL in SQL comparisons
+        ranked = sorted((c['population'], cca2) for cca2, c in self.countries.items() if c['population'] is not None)
+        self._populations = [population for population, _ in ranked]
+        self._by_population = [cca2 for _, cca2 in ranked]
+
+        self.by_currency = defaultdict(list)
+        self.country_currencies = defaultdict(list)
+        for cc in transformed['country_currency']:
+            if cc['country_cca2'] in self.countries:
+                self.by_currency[cc['currency_code']].append(cc['country_cca2'])
+                self.country_currencies[cc['country_cca2']].append(cc['currency_code'])
+
+        self.by_language = defaultdict(list)
+        self.country_languages = defaultdict(list)
+        for cl in transformed['country_language']:
+            if cl['country_cca2'] in self.countries:
+                self.by_language[cl['language_code']].append(cl['country_cca2'])
+                self.country_languages[cl['country_cca2']].append(cl['language_code'])
+
+        logging.info(f"Built country index over {len(self.countries)} countries.")
+
+    def population_between(self, min_population=None, max_population=None):
+        """
+        Returns the cca2 codes with min_population < population <= max_population,
+        in ascending population order. Either bound may be None. Countries
+        without a population never match.
+        """
+        lo = 0 if min_population is None else bisect.bisect_right(self._populations, min_population)
+        hi = len(self._populations) if max_population is None else bisect.bisect_right(self._populations, max_population)
+        return self._by_population[lo:hi]
+
+    # --- SQL/query.sql equivalents --- #
+
+    def large_countries(self, region='Asia', min_population=100000000):
+        """
+        Query 1: (name, population) of countries in region with a population
+        greater than min_population.
+        """
+        return [
+            (self.countries[cca2]['name'], self.countries[cca2]['population'])
+            for cca2 in self.filter(region=region, min_population=min_population)
+        ]
+
+    def currencies_in_region(self, region='Europe'):
+        """
+        Query 2: distinct (name, symbol) of currencies used in region.
+        """
+        used = set()
+        for cca2 in self.by_region.get(region, ()):
+            used.update(self.country_currencies.get(cca2, ()))
+        return {(self.currencies[code]['name'], self.currencies[code]['symbol']) for code in used if code in self.currencies}
+
+    def multi_currency_countries(self, min_currencies=2):
+        """
+        Query 3: (name, region, no_of_currencies) of countries that use at
+        least min_currencies currencies.
+        """
+        return [
+            (self.countries[cca2]['name'], self.countries[cca2]['region'], len(codes))
+            for cca2, codes in self.country_currencies.items()
+            if len(codes) >= min_currencies
+        ]
+
+    # --- Ad-hoc filtering and grouping --- #
+
+    def filter(self, region=None, subregion=None, min_population=None, max_population=None,
+               currency=None, language=None):
+        """
+        Returns the cca2 codes matching every given criterion. The most
+        selective index provides the candidates, the remaining criteria are
+        checked per candidate.
+        """
+        candidates = []
+        if region is not None:
+            candidates.append(self.by_region.get(region, []))
+        if subregion is not None:
+            candidates.append(self.by_subregion.get(subregion, []))
+        if currency is not None:
+            candidates.append(self.by_currency.get(currency, []))
+        if language is not None:
+            candidates.append(self.by_language.get(language, []))
+        if min_population is not None or max_population is not None:
+            candidates.append(self.population_between(min_population, max_population))
+
+        if not candidates:
+            return list(self.countries)
+
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            if not result:
+                break
+            other = set(other)
+            result = [cca2 for cca2 in result if cca2 in other]
+        return list(result)
+
+    def _group_keys(self, field, cca2):
+        if field == 'currency':
+            return self.country_currencies.get(cca2, ())
+        if field == 'language':
+            return self.country_languages.get(cca2, ())
+        return (self.countries[cca2][field],)
+
+    def group_by(self, field, agg='count', value='population', **criteria):
+        """
+        Groups the countries matching criteria (see filter) by field and
+        aggregates value ('population' or 'area') per group.
+        A country with several currencies or languages counts in each group.
+        """
+        if field not in self.GROUP_FIELDS:
+            raise ValueError(f"Cannot group by {field!r}, expected one of {self.GROUP_FIELDS}")
+        if agg not in self.AGGREGATES:
+            raise ValueError(f"Unknown aggregate {agg!r}, expected one of {self.AGGREGATES}")
+        if value not in self.VALUE_FIELDS:
+            raise ValueError(f"Cannot aggregate {value!r}, expected one of {self.VALUE_FIELDS}")
+
+        groups = defaultdict(list)
+        for cca2 in self.filter(**criteria):
+            measure = self.countries[cca2][value] if agg != 'count' else None
+            for key in self._group_keys(field, cca2):
+                groups[key].append(measure)
+
+        result = {}
+        for key, measures in groups.items():
+            if agg == 'count':
+                result[key] = len(measures)
+                continue
+            measures = [m for m in measures if m is not None]
+            if not measures:
+                result[key] = None
+            elif agg == 'sum':
+                result[key] = sum(measures)
+            elif agg == 'min':
+                result[key] = min(measures)
+            elif agg == 'max':
+                result[key] = max(measures)
+            else:
+                result[key] = sum(measures) / len(measures)
+        return result
@@ -0,0 +1,137 @@
+import csv
+import json
+import logging
+
+# --- Source Adapters --- #
+#
+# Every adapter yields flat country records, one at a time:
+#   {'cca2', 'name', 'capital', 'region', 'subregion', 'population', 'area',
+#    'currencies': {code: {'name': ..., 'symbol': ...}}, 'languages': {code: name}}
+# Missing values are None (or empty dicts), so records from any feed can be
+# merged field by field by etl.merge.merge_sources.
+
+COUNTRY_FIELDS = ('cca2', 'name', 'capital', 'region', 'subregion', 'population', 'area')
+
+
+def _flat_record(**values):
+    record = {field: values.get(field) for field in COUNTRY_FIELDS}
+    record['currencies'] = values.get('currencies') or {}
+    record['languages'] = values.get('languages') or {}
+    return record
+
+
+def iter_restcountries(raw_data):
+    """
+    Adapts restcountries API records (as returned by fetch_all_countries_data).
+    """
+    for country in raw_data:
+        currencies = {
+            code: {'name': details.get('name'), 'symbol': details.get('symbol')}
+            for code, details in (country.get('currencies') or {}).items()
+        }
+        yield _flat_record(
+            cca2=country.get('cca2'),
+            name=(country.get('name') or {}).get('common'),
+            capital=(country.get('capital') or [None])[0],
+            region=country.get('region'),
+            subregion=country.get('subregion'),
+            population=country.get('population'),
+            area=country.get('area'),
+            currencies=currencies,
+            languages=dict(country.get('languages') or {})
+        )
+
+
+def _to_number(value, kind):
+    # Empty cells become None. Unparseable values are kept as they are, so the
+    # validation stage can reject and report them.
+    if value is None or value == '':
+        return None
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _parse_pairs(cell, separator=';'):
+    # "USD:US Dollar;EUR:Euro" -> {'USD': 'US Dollar', 'EUR': 'Euro'}
+    pairs = {}
+    for item in (cell or '').split(separator):
+        code, _, name = item.partition(':')
+        if code.strip():
+            pairs[code.strip()] = name.strip() or None
+    return pairs
+
+
+def _cell(row, columns, field):
+    value = row.get(columns.get(field, field))
+    return value.strip() if isinstance(value, str) else value
+
+
+def iter_csv(path, columns=None, delimiter=','):
+    """
+    Streams country records from a CSV file. columns maps record fields to CSV
+    column names and defaults to the field names themselves. The currencies
+    and languages columns hold "CODE:Name" pairs separated by ';'.
+    """
+    columns = columns or {}
+    logging.info(f"Reading country records from CSV: {path}")
+
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        for row in csv.DictReader(csv_file, delimiter=delimiter):
+            currencies = {
+                code: {'name': name, 'symbol': None}
+                for code, name in _parse_pairs(_cell(row, columns, 'currencies')).items()
+            }
+            yield _flat_record(
+                cca2=_cell(row, columns, 'cca2') or None,
+                name=_cell(row, columns, 'name') or None,
+                capital=_cell(row, columns, 'capital') or None,
+                region=_cell(row, columns, 'region') or None,
+                subregion=_cell(row, columns, 'subregion') or None,
+                population=_to_number(_cell(row, columns, 'population'), int),
+                area=_to_number(_cell(row, columns, 'area'), float),
+                currencies=currencies,
+                languages=_parse_pairs(_cell(row, columns, 'languages'))
+            )
+
+
+def iter_json(path, fields=None):
+    """
+    Streams country records from a JSON dump. Only a newline-delimited file
+    (.ndjson/.jsonl) is read line by line with constant memory; a file holding
+    a JSON array is parsed whole, so convert large dumps to NDJSON first.
+    Empty text values become None, as in iter_csv.
+    fields maps record fields to keys in the dump, like columns in iter_csv;
+    currencies and languages are expected in the restcountries shape, name and
+    capital may be flat values or restcountries-style.
+    """
+    fields = fields or {}
+    logging.info(f"Reading country records from JSON: {path}")
+
+    def records():
+        with open(path, encoding='utf-8') as json_file:
+            if path.endswith(('.ndjson', '.jsonl')):
+                for line in json_file:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from json.load(json_file)
+
+    for item in records():
+        values = {field: item.get(fields.get(field, field)) for field in COUNTRY_FIELDS + ('currencies', 'languages')}
+        # Accept restcountries-style dumps as well as flat ones
+        if isinstance(values['name'], dict):
+            values['name'] = values['name'].get('common')
+        if isinstance(values['capital'], list):
+            values['capital'] = (values['capital'] or [None])[0]
+        for field in ('cca2', 'name', 'capital', 'region', 'subregion'):
+            if isinstance(values[field], str):
+                values[field] = values[field].strip() or None
+        currencies = {
+            code: {'name': details.get('name'), 'symbol': details.get('symbol')} if isinstance(details, dict)
+            else {'name': details, 'symbol': None}
+            for code, details in (values['currencies'] or {}).items()
+        }
+        values['currencies'] = currencies
+        yield _flat_record(**values)
@@ -0,0 +1,171 @@
+import csv
+import logging
+import os
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+# --- Validation --- #
+
+# A rule checks one column; check takes the whole column as an object-dtype
+# pandas Series and returns a boolean Series, True where the value is valid.
+Rule = namedtuple('Rule', ['column', 'name', 'check'])
+
+# Limits from SQL/DB_Schema.sql
+CCA2_MAX_LENGTH = 3
+TEXT_MAX_LENGTH = 255
+BIGINT_MAX = 2 ** 63 - 1
+
+
+def _is_none(column):
+    return column.map(type).eq(type(None))
+
+
+def _text(column):
+    # The str values of column, NaN for everything else
+    return column.where(column.map(type).eq(str))
+
+
+def _is_text(column, max_length=None):
+    text = _text(column)
+    valid = text.str.strip().str.len().gt(0)
+    if max_length is not None:
+        valid &= text.str.len().le(max_length)
+    return valid
+
+
+def _is_optional_text(column, max_length=TEXT_MAX_LENGTH):
+    return _is_none(column) | _text(column).str.len().le(max_length)
+
+
+def _numbers(column):
+    # int and float values as float64, NaN for everything else (bool is a
+    # subclass of int but is never a valid measurement)
+    return pd.to_numeric(column.where(column.map(type).isin([int, float])), errors='coerce')
+
+
+def _is_non_negative_integer(column):
+    numbers = _numbers(column)
+    # float64 cannot tell BIGINT_MAX from BIGINT_MAX + 1, so the upper bound
+    # is checked on the original values
+    in_range = column.where(numbers.notna(), 0).le(BIGINT_MAX)
+    return _is_none(column) | (np.isfinite(numbers) & numbers.ge(0) & numbers.eq(np.floor(numbers)) & in_range)
+
+
+def _is_non_negative_number(column):
+    numbers = _numbers(column)
+    return _is_none(column) | (np.isfinite(numbers) & numbers.ge(0))
+
+
+RULES = {
+    'countries': [
+        Rule('cca2', 'cca2_format', lambda c: _is_text(c, CCA2_MAX_LENGTH)),
+        Rule('name', 'name_required', lambda c: _is_text(c, TEXT_MAX_LENGTH)),
+        Rule('capital', 'capital_length', _is_optional_text),
+        Rule('region', 'region_length', _is_optional_text),
+        Rule('subregion', 'subregion_length', _is_optional_text),
+        Rule('population', 'population_non_negative_integer', _is_non_negative_integer),
+        Rule('area', 'area_non_negative_number', _is_non_negative_number),
+    ],
+    'currencies': [
+        Rule('code', 'code_required', _is_text),
+        Rule('name', 'name_required', _is_text),
+        Rule('symbol', 'symbol_text', lambda c: _is_none(c) | c.map(type).eq(str)),
+    ],
+    'languages': [
+        Rule('code', 'code_required', _is_text),
+        Rule('name', 'name_required', _is_text),
+    ],
+}
+
+# Column identifying a row in the rejected-row report
+KEY_COLUMNS = {'countries': 'cca2', 'currencies': 'code', 'languages': 'code'}
+
+
+def _failed_rows(rows, rules):
+    """
+    Runs every rule as a mask over its whole column and returns
+    {row index: [(rule, value), ...]} for the rows that failed.
+    """
+    # object dtype keeps the values as they are: None stays None instead of
+    # becoming NaN, and ints are not widened to float
+    frame = pd.DataFrame({
+        column: pd.Series([row.get(column) for row in rows], dtype=object)
+        for column in dict.fromkeys(rule.column for rule in rules)
+    })
+    failures = {}
+    for rule in rules:
+        column = frame[rule.column]
+        failed = ~rule.check(column).to_numpy(dtype=bool)
+        for i in np.flatnonzero(failed).tolist():
+            failures.setdefault(i, []).append((rule, column.iat[i]))
+    return failures
+
+
+def validate_transformed_data(transformed, rules=None):
+    """
+    Checks the output of transform_country_data against the schema rules in a
+    single pass per table. Returns (valid, rejected): valid has the same shape
+    as transformed without the rejected rows, and junction rows pointing at a
+    rejected country, currency or language are dropped as well. rejected is a
+    list of dicts with table, key, column, rule and value.
+    """
+    rules = RULES if rules is None else rules
+    logging.info("Validating transformed data...")
+    valid = dict(transformed)
+    rejected = []
+    kept_keys = {}
+
+    for table, table_rules in rules.items():
+        rows = transformed[table]
+        failures = _failed_rows(rows, table_rules)
+        key_column = KEY_COLUMNS.get(table)
+
+        for i in sorted(failures):
+            for rule, value in failures[i]:
+                rejected.append({
+                    'table': table,
+                    'key': rows[i].get(key_column) if key_column else i,
+                    'column': rule.column,
+                    'rule': rule.name,
+                    'value': value
+                })
+
+        valid[table] = [row for i, row in enumerate(rows) if i not in failures]
+        if key_column:
+            kept_keys[table] = {row.get(key_column) for row in valid[table]}
+
+    countries = kept_keys.get('countries')
+    currencies = kept_keys.get('currencies')
+    languages = kept_keys.get('languages')
+    valid['country_currency'] = [
+        cc for cc in transformed['country_currency']
+        if (countries is None or cc['country_cca2'] in countries)
+        and (currencies is None or cc['currency_code'] in currencies)
+    ]
+    valid['country_language'] = [
+        cl for cl in transformed['country_language']
+        if (countries is None or cl['country_cca2'] in countries)
+        and (languages is None or cl['language_code'] in languages)
+    ]
+
+    if rejected:
+        logging.warning(f"Validation rejected {len(rejected)} values in {len({(r['table'], r['key']) for r in rejected})} rows.")
+    logging.info(f"Validation complete. {len(valid['countries'])} countries, {len(valid['currencies'])} currencies and {len(valid['languages'])} languages passed.")
+    return valid, rejected
+
+
+def write_rejected_report(rejected, path):
+    """
+    Writes the rejected rows to a CSV report at path, replacing any previous
+    report. With nothing rejected the report holds only the header.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w', newline='', encoding='utf-8') as report:
+        writer = csv.DictWriter(report, fieldnames=['table', 'key', 'column', 'rule', 'value'])
+        writer.writeheader()
+        writer.writerows(rejected)
+    logging.info(f"Wrote {len(rejected)} rejected values to {path}")
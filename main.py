@@ -4,12 +4,15 @@ try:
     import logging
     from etl.extract import fetch_all_countries_data
     from etl.transform import transform_country_data
+    from etl.validate import validate_transformed_data, write_rejected_report
 
     from Database.connection import get_db_connection
     from Database.load import insert_data_to_db
     from Database.init_db import init_database
+    from Database.export import refresh_country_documents, export_country_documents
+    from Database.profiler import ProfilingConnection, LoadProfiler
 
-    from config.settings import API_URL
+    from config.settings import API_URL, EXPORT_DIR, REJECTED_REPORT_PATH, LOAD_PROFILE, LOAD_PROFILE_PATH
 
 except ImportError as e:
     print(f"Error importing modules: {e}")
@@ -25,17 +28,34 @@ if __name__ == "__main__":
         # 2. Transform data
         transformed_data = transform_country_data(raw_country_data)
 
-        # 3. Initialize database (create tables if they don't exist)
+        # 3. Validate data, so rows the database would reject never reach it
+        # (the report is always rewritten, so it never shows a previous run's rejections)
+        transformed_data, rejected_rows = validate_transformed_data(transformed_data)
+        write_rejected_report(rejected_rows, REJECTED_REPORT_PATH)
+
+        # 4. Initialize database (create tables if they don't exist)
         if not init_database():
             logging.error("Failed to initialize database. ETL process aborted.")
             exit(1)
 
-        # 4. Get database connection
-        db_connection = get_db_connection()
+        # 5. Get database connection
+        db_connection = get_db_connection(connection_factory=ProfilingConnection if LOAD_PROFILE else None)
 
         if db_connection:
-            # 5. Insert data into the database
-            insert_data_to_db(db_connection, transformed_data)
+            # 6. Insert data into the database
+            if LOAD_PROFILE:
+                with LoadProfiler(db_connection, sampler_connect=get_db_connection) as profiler:
+                    insert_data_to_db(db_connection, transformed_data)
+                logging.info("Load profile:\n" + profiler.summary())
+                profiler.write(LOAD_PROFILE_PATH)
+            else:
+                insert_data_to_db(db_connection, transformed_data)
+
+            # 7. Rebuild the changed documents and dump all of them to file
+            # (also when none changed, so a missing or failed export is rewritten)
+            changed = refresh_country_documents(db_connection)
+            if changed is not None:
+                export_country_documents(db_connection, EXPORT_DIR)
 
             # Close the database connection
             db_connection.close()
@@ -1,75 +1,61 @@
 # tests/conftest.py
+import os
 import pytest
-import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from Database.connection import get_db_connection
+from tests.pg_harness import PostgresHarness
 import requests_mock
 
-@pytest.fixture(scope="module")
-def db_connection():
-    conn = get_db_connection()
-    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    cursor = conn.cursor()
+@pytest.fixture(scope="session")
+def pg_harness():
+    """Throwaway Postgres with a template database built from SQL/DB_Schema.sql."""
+    # Parallel workers (pytest-xdist) each get their own server and template
+    worker = os.getenv("PYTEST_XDIST_WORKER", "")
+    harness = PostgresHarness(suffix=f"_{worker}" if worker else "")
+    with harness:
+        yield harness
 
-    # Create tables
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS currency (
-            id SERIAL PRIMARY KEY,
-            code VARCHAR(10) UNIQUE,
-            name TEXT,
-            symbol TEXT
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS language (
-            id SERIAL PRIMARY KEY,
-            code VARCHAR(10) UNIQUE,
-            name TEXT
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS country (
-            id SERIAL PRIMARY KEY,
-            cca2 VARCHAR(2) UNIQUE,
-            name TEXT,
-            capital TEXT,
-            region TEXT,
-            subregion TEXT,
-            population INTEGER,
-            area FLOAT
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS country_currency (
-            country_id INTEGER REFERENCES country(id),
-            currency_id INTEGER REFERENCES currency(id),
-            PRIMARY KEY (country_id, currency_id)
-        )
-    """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS country_language (
-            country_id INTEGER REFERENCES country(id),
-            language_id INTEGER REFERENCES language(id),
-            PRIMARY KEY (country_id, language_id)
-        )
-    """)
+@pytest.fixture
+def db_connection(pg_harness):
+    """Connection to a fresh copy of the template database, dropped after the test."""
+    dbname = pg_harness.clone()
+    conn = pg_harness.connect(dbname)
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
 
     yield conn
 
-    # Teardown: Drop all tables
-    cursor.execute("DROP TABLE IF EXISTS country_language, country_currency, country, language, currency")
-    cursor.close()
     conn.close()
+    pg_harness.drop(dbname)
 
-@pytest.fixture(autouse=True)
-def clean_tables(db_connection):
-    """Clear all tables before each test to ensure a clean state."""
-    cursor = db_connection.cursor()
-    cursor.execute("TRUNCATE TABLE country_language, country_currency, country, language, currency RESTART IDENTITY CASCADE")
-    cursor.close()
+@pytest.fixture
+def load_data():
+    """Two countries with their currencies and languages, as insert_data_to_db takes them."""
+    return {
+        "currencies": [
+            {"code": "USD", "name": "US Dollar", "symbol": "$"},
+            {"code": "EUR", "name": "Euro", "symbol": "€"}
+        ],
+        "languages": [
+            {"code": "en", "name": "English"},
+            {"code": "es", "name": "Spanish"}
+        ],
+        "countries": [
+            {"cca2": "US", "name": "United States", "capital": "Washington, D.C.", "region": "Americas",
+             "subregion": "North America", "population": 331000000, "area": 9833517.0},
+            {"cca2": "ES", "name": "Spain", "capital": "Madrid", "region": "Europe",
+             "subregion": "Southern Europe", "population": 47350000, "area": 505990.0}
+        ],
+        "country_currency": [
+            {"country_cca2": "US", "currency_code": "USD"},
+            {"country_cca2": "ES", "currency_code": "EUR"}
+        ],
+        "country_language": [
+            {"country_cca2": "US", "language_code": "en"},
+            {"country_cca2": "ES", "language_code": "es"}
+        ]
+    }
 
 
 @pytest.fixture
 def mock_api():
     with requests_mock.Mocker() as m:
-        yield m
\ No newline at end of file
+        yield m
@@ -0,0 +1,187 @@
+# tests/pg_harness.py
+"""
+Throwaway Postgres for tests and benchmarks.
+
+The harness starts a private Postgres cluster in a temporary directory (when
+initdb and pg_ctl are on PATH or in PG_BIN), applies SQL/DB_Schema.sql once
+into a template database, and hands out per-test copies made with
+CREATE DATABASE ... TEMPLATE. Copying a template is a file-level copy, much
+cheaper than creating the tables again or truncating them between tests.
+
+Without Postgres binaries (or when running as root, which initdb refuses,
+or when initdb fails) it falls back to the server in config/settings.py and
+only creates (and drops) its own databases there.
+"""
+import contextlib
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import uuid
+
+import psycopg2 as pg
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from config.settings import DB_HOST, DB_USER, DB_PASSWORD, DB_PORT
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'SQL', 'DB_Schema.sql')
+
+# Durability is irrelevant for a throwaway cluster
+FAST_SETTINGS = ['fsync=off', 'synchronous_commit=off', 'full_page_writes=off']
+
+
+def _find_binary(name):
+    pg_bin = os.getenv('PG_BIN')
+    if pg_bin and os.path.exists(os.path.join(pg_bin, name)):
+        return os.path.join(pg_bin, name)
+    return shutil.which(name)
+
+
+def _is_root():
+    return hasattr(os, 'geteuid') and os.geteuid() == 0
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class PostgresHarness:
+    """
+    Owns one Postgres server (started or borrowed) and one template database.
+    Give each parallel worker its own suffix so their databases never clash.
+    """
+
+    def __init__(self, suffix='', schema_path=SCHEMA_PATH, managed=None):
+        self.suffix = suffix
+        self.schema_path = schema_path
+        self.template = f"country_template{suffix}"
+        self.initdb = _find_binary('initdb')
+        self.pg_ctl = _find_binary('pg_ctl')
+        # Only an auto-detected managed server falls back to the configured one
+        self.fallback = managed is None
+        if managed is None:
+            managed = bool(self.initdb and self.pg_ctl) and not _is_root()
+        self.managed = managed
+        self.data_dir = None
+        self.params = None
+
+    # --- Server --- #
+
+    def start(self):
+        if not self.managed:
+            self.params = {'host': DB_HOST, 'port': DB_PORT, 'user': DB_USER, 'password': DB_PASSWORD}
+            return self
+
+        self.data_dir = tempfile.mkdtemp(prefix='country_pg_')
+        try:
+            subprocess.run(
+                [self.initdb, '-D', self.data_dir, '-U', 'postgres', '-A', 'trust', '-E', 'UTF8', '--no-sync'],
+                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            self.stop()
+            if not self.fallback:
+                raise
+            logging.warning(f"initdb failed ({e}), using the configured Postgres server instead.")
+            self.managed = False
+            return self.start()
+
+        try:
+            port = _free_port()
+            options = f"-p {port} -k {self.data_dir} -c listen_addresses=127.0.0.1 " + ' '.join(f"-c {s}" for s in FAST_SETTINGS)
+            subprocess.run(
+                [self.pg_ctl, '-D', self.data_dir, '-o', options, '-l', os.path.join(self.data_dir, 'server.log'), '-w', 'start'],
+                check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
+        except Exception:
+            self.stop()
+            raise
+        self.params = {'host': '127.0.0.1', 'port': port, 'user': 'postgres'}
+        return self
+
+    def stop(self):
+        if not self.managed:
+            self._drop_template()
+            return
+        if self.data_dir:
+            subprocess.run([self.pg_ctl, '-D', self.data_dir, '-m', 'immediate', 'stop'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            shutil.rmtree(self.data_dir, ignore_errors=True)
+            self.data_dir = None
+
+    def __enter__(self):
+        self.start()
+        try:
+            self.create_template()
+        except Exception:
+            # Do not leak the server or its data directory; report the
+            # original error rather than one from the cleanup
+            with contextlib.suppress(pg.Error):
+                self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Databases --- #
+
+    def connect(self, dbname, **kwargs):
+        return pg.connect(dbname=dbname, **self.params, **kwargs)
+
+    def _admin(self, *statements):
+        conn = self.connect('postgres')
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with conn.cursor() as cur:
+                for statement in statements:
+                    cur.execute(statement)
+        finally:
+            conn.close()
+
+    def _drop_template(self):
+        # A template database has to be unflagged before it can be dropped
+        conn = self.connect('postgres')
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.template,))
+                if cur.fetchone():
+                    cur.execute(f'ALTER DATABASE "{self.template}" WITH IS_TEMPLATE false')
+                    cur.execute(f'DROP DATABASE "{self.template}"')
+        finally:
+            conn.close()
+
+    def create_template(self):
+        """
+        Creates the template database from the production schema.
+        """
+        self._drop_template()
+        self._admin(f'CREATE DATABASE "{self.template}"')
+
+        conn = self.connect(self.template)
+        try:
+            with conn.cursor() as cur, open(self.schema_path, 'r') as schema_file:
+                cur.execute(schema_file.read())
+            conn.commit()
+        finally:
+            conn.close()
+
+        # No connections allowed, so CREATE DATABASE ... TEMPLATE never finds it busy
+        self._admin(f'ALTER DATABASE "{self.template}" WITH IS_TEMPLATE true ALLOW_CONNECTIONS false')
+        return self.template
+
+    def clone(self, name=None):
+        """
+        Creates a fresh copy of the template database and returns its name.
+        """
+        name = name or f"country_test{self.suffix}_{uuid.uuid4().hex[:12]}"
+        self._admin(f'CREATE DATABASE "{name}" TEMPLATE "{self.template}"')
+        return name
+
+    def drop(self, name):
+        self._admin(f'DROP DATABASE IF EXISTS "{name}"')
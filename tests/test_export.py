@@ -0,0 +1,136 @@
+# tests/test_export.py
+import pytest
+from Database.load import insert_data_to_db
+from Database.export import (
+    refresh_country_documents,
+    export_country_documents,
+    write_document_files,
+    CountryDocumentIndex
+)
+from tests.pg_harness import SCHEMA_PATH
+
+def test_refresh_country_documents(db_connection, load_data):
+    # A second language, so the document has to keep them in code order
+    load_data["country_language"].append({"country_cca2": "US", "language_code": "es"})
+    insert_data_to_db(db_connection, load_data)
+
+    assert refresh_country_documents(db_connection) == 2
+
+    cursor = db_connection.cursor()
+    cursor.execute("SELECT document FROM country_document WHERE cca2 = 'US'")
+    document = cursor.fetchone()[0]
+    assert document["name"] == "United States"
+    assert document["currencies"] == [{"code": "USD", "name": "US Dollar", "symbol": "$"}]
+    assert document["languages"] == [
+        {"code": "en", "name": "English"},
+        {"code": "es", "name": "Spanish"}
+    ]
+    cursor.close()
+
+def test_refresh_country_documents_only_changed(db_connection, load_data):
+    insert_data_to_db(db_connection, load_data)
+    refresh_country_documents(db_connection)
+
+    # Nothing changed, nothing is rewritten
+    assert refresh_country_documents(db_connection) == 0
+
+    load_data["countries"][1]["population"] = 48000000
+    insert_data_to_db(db_connection, load_data)
+    assert refresh_country_documents(db_connection) == 1
+    assert refresh_country_documents(db_connection, ["US"]) == 0
+
+def test_schema_rerun_keeps_documents(db_connection, load_data):
+    insert_data_to_db(db_connection, load_data)
+    refresh_country_documents(db_connection)
+
+    # main.py applies the schema on every run, which must not reset the tables
+    with open(SCHEMA_PATH, encoding="utf-8") as schema_file:
+        cursor = db_connection.cursor()
+        cursor.execute(schema_file.read())
+        cursor.close()
+
+    insert_data_to_db(db_connection, load_data)
+    assert refresh_country_documents(db_connection) == 0
+
+def test_export_country_documents(db_connection, load_data, tmp_path):
+    insert_data_to_db(db_connection, load_data)
+    refresh_country_documents(db_connection)
+
+    assert export_country_documents(db_connection, str(tmp_path)) == 2
+    assert (tmp_path / "current").is_symlink()
+
+    with CountryDocumentIndex.from_dir(str(tmp_path)) as index:
+        assert index["ES"]["capital"] == "Madrid"
+        assert index.get("FR") is None
+
+def test_export_country_documents_swaps_current(db_connection, load_data, tmp_path):
+    insert_data_to_db(db_connection, load_data)
+    refresh_country_documents(db_connection)
+    export_country_documents(db_connection, str(tmp_path))
+
+    # A reader holding the previous export keeps its files while a new one is published
+    with CountryDocumentIndex.from_dir(str(tmp_path)) as old_index:
+        load_data["countries"][1]["capital"] = "Madrid (new)"
+        insert_data_to_db(db_connection, load_data)
+        refresh_country_documents(db_connection)
+        export_country_documents(db_connection, str(tmp_path))
+        export_country_documents(db_connection, str(tmp_path))
+
+        assert old_index["ES"]["capital"] == "Madrid"
+
+    with CountryDocumentIndex.from_dir(str(tmp_path)) as index:
+        assert index["ES"]["capital"] == "Madrid (new)"
+    # Only the current and the previous export are kept
+    assert len([p for p in tmp_path.iterdir() if p.name.startswith("export-")]) == 2
+
+def test_export_country_documents_invalid_cca2(db_connection, tmp_path):
+    cursor = db_connection.cursor()
+    cursor.execute("INSERT INTO country (cca2, name) VALUES ('ÉS', 'Invalid')")
+    cursor.close()
+    refresh_country_documents(db_connection)
+
+    assert export_country_documents(db_connection, str(tmp_path)) is None
+    assert list(tmp_path.iterdir()) == []
+
+def test_country_document_index_lookup(tmp_path):
+    documents = [(f"{a}{b}", {"cca2": f"{a}{b}", "name": f"Country {a}{b}"}) for a in "ABCDEFGHIJ" for b in "XYZ"]
+    ndjson_path = str(tmp_path / "countries.ndjson")
+    index_path = str(tmp_path / "countries.idx")
+
+    assert write_document_files(documents, ndjson_path, index_path) == 30
+
+    with CountryDocumentIndex(ndjson_path, index_path) as index:
+        for cca2, document in documents:
+            assert index[cca2] == document
+        assert "ZZ" not in index
+        assert index.get("TOOLONG") is None
+        with pytest.raises(KeyError):
+            index["QQ"]
+
+def test_country_document_index_empty(tmp_path):
+    ndjson_path = str(tmp_path / "countries.ndjson")
+    index_path = str(tmp_path / "countries.idx")
+    write_document_files([], ndjson_path, index_path)
+
+    with CountryDocumentIndex(ndjson_path, index_path) as index:
+        assert index.get("US") is None
+
+def test_country_document_index_mismatched_files(tmp_path):
+    old_dir, new_dir = tmp_path / "old", tmp_path / "new"
+    old_dir.mkdir()
+    new_dir.mkdir()
+    write_document_files([("US", {"cca2": "US"})], str(old_dir / "countries.ndjson"), str(old_dir / "countries.idx"))
+    write_document_files([("ES", {"cca2": "ES", "name": "Spain"})], str(new_dir / "countries.ndjson"), str(new_dir / "countries.idx"))
+
+    # New data with the old index, as a reader could see while files are replaced one by one
+    with pytest.raises(ValueError):
+        CountryDocumentIndex(str(new_dir / "countries.ndjson"), str(old_dir / "countries.idx"))
+
+def test_country_document_index_checks_cca2(tmp_path):
+    ndjson_path = str(tmp_path / "countries.ndjson")
+    index_path = str(tmp_path / "countries.idx")
+    write_document_files([("US", {"cca2": "ES"})], ndjson_path, index_path)
+
+    with CountryDocumentIndex(ndjson_path, index_path) as index:
+        with pytest.raises(ValueError):
+            index.get("US")
@@ -0,0 +1,139 @@
+# tests/test_merge.py
+import json
+import pytest
+from etl.sources import iter_restcountries, iter_csv, iter_json
+from etl.merge import merge_sources
+from etl.transform import transform_country_data
+
+@pytest.fixture
+def restcountries_data():
+    return [
+        {
+            "cca2": "US",
+            "name": {"common": "United States"},
+            "capital": ["Washington, D.C."],
+            "region": "Americas",
+            "subregion": "North America",
+            "population": 331000000,
+            "area": 9833517.0,
+            "currencies": {"USD": {"name": "United States dollar", "symbol": "$"}},
+            "languages": {"eng": "English"}
+        },
+        {
+            "cca2": "ES",
+            "name": {"common": "Spain"},
+            "capital": ["Madrid"],
+            "region": "Europe",
+            "subregion": "Southern Europe",
+            "population": 47350000,
+            "area": 505990.0,
+            "currencies": {"EUR": {"name": "Euro", "symbol": "€"}},
+            "languages": {"spa": "Spanish"}
+        }
+    ]
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "countries.csv"
+    path.write_text(
+        "code,country,population,currencies,languages\n"
+        "us,USA,335000000,USD:US Dollar,eng:English;spa:Spanish\n"
+        "FR,France,67000000,EUR:Euro,fra:French\n"
+        ",Nowhere,1,,\n",
+        encoding="utf-8"
+    )
+    return str(path)
+
+@pytest.mark.merge
+def test_iter_csv(csv_path):
+    records = list(iter_csv(csv_path, columns={"cca2": "code", "name": "country"}))
+    assert len(records) == 3
+    assert records[1] == {
+        "cca2": "FR", "name": "France", "capital": None, "region": None, "subregion": None,
+        "population": 67000000, "area": None,
+        "currencies": {"EUR": {"name": "Euro", "symbol": None}},
+        "languages": {"fra": "French"}
+    }
+
+@pytest.mark.merge
+@pytest.mark.parametrize("filename", ["dump.json", "dump.ndjson"])
+def test_iter_json(tmp_path, restcountries_data, filename):
+    path = tmp_path / filename
+    if filename.endswith(".ndjson"):
+        path.write_text("\n".join(json.dumps(c) for c in restcountries_data), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(restcountries_data), encoding="utf-8")
+
+    records = list(iter_json(str(path)))
+    assert records == list(iter_restcountries(restcountries_data))
+
+@pytest.mark.merge
+def test_iter_json_empty_text(tmp_path):
+    path = tmp_path / "dump.ndjson"
+    path.write_text(json.dumps({"cca2": "FR", "name": "France", "capital": "", "region": "  "}), encoding="utf-8")
+
+    record = next(iter_json(str(path)))
+    assert record["capital"] is None
+    assert record["region"] is None
+
+@pytest.mark.merge
+def test_merge_sources_default_precedence(restcountries_data, csv_path):
+    merged = merge_sources([
+        ("restcountries", iter_restcountries(restcountries_data)),
+        ("csv", iter_csv(csv_path, columns={"cca2": "code", "name": "country"}))
+    ])
+    by_cca2 = {c["cca2"]: c for c in merged}
+
+    assert sorted(by_cca2) == ["ES", "FR", "US"]
+    # restcountries ranks first, the CSV only fills gaps
+    assert by_cca2["US"]["name"] == {"common": "United States"}
+    assert by_cca2["US"]["population"] == 331000000
+    assert by_cca2["US"]["currencies"] == {"USD": {"name": "United States dollar", "symbol": "$"}}
+    assert by_cca2["US"]["languages"] == {"eng": "English", "spa": "Spanish"}
+    assert by_cca2["FR"]["capital"] == [None]
+
+@pytest.mark.merge
+def test_merge_sources_field_precedence(restcountries_data, csv_path):
+    merged = merge_sources(
+        [
+            ("restcountries", iter_restcountries(restcountries_data)),
+            ("csv", iter_csv(csv_path, columns={"cca2": "code", "name": "country"}))
+        ],
+        precedence={"population": ["csv"], "currencies": ["csv", "restcountries"]}
+    )
+    us = {c["cca2"]: c for c in merged}["US"]
+
+    assert us["population"] == 335000000
+    assert us["name"] == {"common": "United States"}
+    # The CSV name wins, the symbol it lacks is kept from restcountries
+    assert us["currencies"] == {"USD": {"name": "US Dollar", "symbol": "$"}}
+
+@pytest.mark.merge
+def test_merge_sources_dedups_within_source(restcountries_data):
+    duplicate = dict(restcountries_data[1], population=None, capital=["Other"])
+    merged = merge_sources([("restcountries", iter_restcountries(restcountries_data + [duplicate]))])
+
+    assert len(merged) == 2
+    spain = {c["cca2"]: c for c in merged}["ES"]
+    assert spain["population"] == 47350000
+    assert spain["capital"] == ["Madrid"]
+
+@pytest.mark.merge
+def test_merge_sources_feeds_transform(restcountries_data, csv_path):
+    merged = merge_sources([
+        ("restcountries", iter_restcountries(restcountries_data)),
+        ("csv", iter_csv(csv_path, columns={"cca2": "code", "name": "country"}))
+    ])
+    result = transform_country_data(merged)
+    assert len(result["countries"]) == 3
+    assert {"country_cca2": "US", "language_code": "spa"} in result["country_language"]
+
+@pytest.mark.merge
+def test_merge_sources_unknown_precedence_field():
+    with pytest.raises(ValueError):
+        merge_sources([("a", [])], precedence={"colour": ["a"]})
+
+@pytest.mark.merge
+def test_merge_sources_unknown_precedence_source():
+    with pytest.raises(ValueError):
+        merge_sources([("internal", [])], precedence={"population": ["interal"]})
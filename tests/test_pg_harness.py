@@ -0,0 +1,43 @@
+# tests/test_pg_harness.py
+import pytest
+from tests.pg_harness import PostgresHarness
+
+def test_clone_uses_production_schema(db_connection):
+    cursor = db_connection.cursor()
+    cursor.execute("""
+        SELECT column_name, data_type, character_maximum_length
+        FROM information_schema.columns
+        WHERE table_name = 'country' AND column_name IN ('cca2', 'population')
+        ORDER BY column_name
+    """)
+    assert cursor.fetchall() == [
+        ("cca2", "character varying", 3),
+        ("population", "bigint", None)
+    ]
+    cursor.close()
+
+def test_clones_are_isolated(pg_harness, db_connection):
+    cursor = db_connection.cursor()
+    cursor.execute("INSERT INTO language (code, name) VALUES ('en', 'English')")
+    cursor.close()
+
+    other = pg_harness.clone()
+    conn = pg_harness.connect(other)
+    try:
+        with conn.cursor() as other_cursor:
+            other_cursor.execute("SELECT count(*) FROM language")
+            assert other_cursor.fetchone() == (0,)
+    finally:
+        conn.close()
+        pg_harness.drop(other)
+
+def test_failed_setup_is_cleaned_up(pg_harness, tmp_path):
+    harness = PostgresHarness(suffix="_broken", schema_path=str(tmp_path / "missing.sql"), managed=pg_harness.managed)
+    with pytest.raises(FileNotFoundError):
+        harness.__enter__()
+    assert harness.data_dir is None
+
+def test_root_uses_configured_server(monkeypatch):
+    # initdb refuses to run as root
+    monkeypatch.setattr("os.geteuid", lambda: 0, raising=False)
+    assert PostgresHarness().managed is False
@@ -0,0 +1,73 @@
+# tests/test_profiler.py
+import pytest
+import psycopg2 as pg
+from Database.load import insert_data_to_db
+from Database.profiler import ProfilingConnection, LoadProfiler, normalize_sql, sql_table
+
+@pytest.fixture
+def profiled_connection(pg_harness, db_connection):
+    conn = pg_harness.connect(db_connection.info.dbname, connection_factory=ProfilingConnection)
+    yield conn
+    conn.close()
+
+def test_normalize_sql():
+    query = """
+        INSERT INTO country (cca2, name)
+        VALUES (%s, %(name)s) -- comment
+        RETURNING id;
+    """
+    assert normalize_sql(query) == "INSERT INTO country (cca2, name) VALUES ? RETURNING id"
+
+def test_normalize_sql_matches_pg_stat_statements():
+    # Client template vs. what pg_stat_statements records after psycopg2 expands the tuple
+    client = "SELECT id, code FROM currency WHERE code IN %s"
+    server = "SELECT id, code FROM currency WHERE code IN ($1, $2, $3)"
+    assert normalize_sql(client) == normalize_sql(server) == "SELECT id, code FROM currency WHERE code IN ?"
+    assert normalize_sql("VALUES (%s, %s)") == normalize_sql("VALUES ($1,$2)")
+    # Newer pg_stat_statements versions squash long IN lists into a comment
+    squashed = "SELECT id, code FROM currency WHERE code IN ($1 /*, ... */)"
+    assert normalize_sql(squashed) == normalize_sql(client)
+
+def test_sql_table():
+    assert sql_table("INSERT INTO country_currency (country_id) VALUES (?)") == "country_currency"
+    assert sql_table("SELECT id, code FROM language WHERE code IN ?") == "language"
+    assert sql_table("COMMIT") == "other"
+
+def test_load_profiler_counts_round_trips(profiled_connection, load_data, pg_harness, tmp_path):
+    sampler = lambda: pg_harness.connect(profiled_connection.info.dbname)
+    with LoadProfiler(profiled_connection, sampler_connect=sampler) as profiler:
+        insert_data_to_db(profiled_connection, load_data)
+
+    by_table = {}
+    for template, stats in profiled_connection.profile.items():
+        by_table.setdefault(sql_table(template), []).append(stats)
+
+    # One executemany per block, but one round trip per row
+    assert [(s["executes"], s["round_trips"]) for s in by_table["currency"]] == [(1, 2), (1, 1)]
+    # The country UPSERT runs once per country
+    assert [(s["executes"], s["round_trips"]) for s in by_table["country"]] == [(2, 2)]
+    assert by_table["country_language"][0]["round_trips"] == 2
+
+    totals = profiler.totals()
+    assert totals["round_trips"] == 2 + 2 + 2 + 1 + 1 + 2 + 2 + 1  # the last one is COMMIT
+    assert totals["bytes"] > 0
+    assert "country" in profiler.summary()
+
+    path = tmp_path / "load.folded"
+    profiler.write(str(path))
+    lines = path.read_text().splitlines()
+    assert all(line.startswith("insert_data_to_db;") for line in lines)
+    assert any(line.startswith("insert_data_to_db;country;INSERT INTO country ") for line in lines)
+
+def test_failed_executemany_is_not_recorded(profiled_connection):
+    query = "INSERT INTO currency (code, name) VALUES (%s, %s)"
+    cursor = profiled_connection.cursor()
+    with pytest.raises(pg.errors.NotNullViolation):
+        cursor.executemany(query, [("USD", "US Dollar"), ("EUR", None)])
+    profiled_connection.rollback()
+
+    assert normalize_sql(query) not in profiled_connection.profile
+
+def test_load_profiler_requires_profiling_connection(db_connection):
+    with pytest.raises(TypeError):
+        LoadProfiler(db_connection)
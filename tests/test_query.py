@@ -0,0 +1,88 @@
+# tests/test_query.py
+import pytest
+from etl.transform import transform_country_data
+from etl.query import CountryIndex
+
+@pytest.fixture
+def index():
+    raw_data = [
+        {
+            "cca2": "IN", "name": {"common": "India"}, "capital": ["New Delhi"],
+            "region": "Asia", "subregion": "Southern Asia", "population": 1380004385, "area": 3287590.0,
+            "currencies": {"INR": {"name": "Indian rupee", "symbol": "₹"}},
+            "languages": {"eng": "English", "hin": "Hindi"}
+        },
+        {
+            "cca2": "BT", "name": {"common": "Bhutan"}, "capital": ["Thimphu"],
+            "region": "Asia", "subregion": "Southern Asia", "population": 771612, "area": 38394.0,
+            "currencies": {"BTN": {"name": "Bhutanese ngultrum", "symbol": "Nu."}, "INR": {"name": "Indian rupee", "symbol": "₹"}},
+            "languages": {"dzo": "Dzongkha"}
+        },
+        {
+            "cca2": "ES", "name": {"common": "Spain"}, "capital": ["Madrid"],
+            "region": "Europe", "subregion": "Southern Europe", "population": 47351567, "area": 505992.0,
+            "currencies": {"EUR": {"name": "Euro", "symbol": "€"}},
+            "languages": {"spa": "Spanish"}
+        },
+        {
+            "cca2": "IE", "name": {"common": "Ireland"}, "capital": ["Dublin"],
+            "region": "Europe", "subregion": "Northern Europe", "population": 4994724, "area": 70273.0,
+            "currencies": {"EUR": {"name": "Euro", "symbol": "€"}},
+            "languages": {"eng": "English", "gle": "Irish"}
+        },
+        {
+            "cca2": "AQ", "name": {"common": "Antarctica"}, "capital": [None],
+            "region": "Antarctic", "subregion": None, "population": None, "area": 14000000.0
+        }
+    ]
+    return CountryIndex(transform_country_data(raw_data))
+
+@pytest.mark.query
+def test_large_countries(index):
+    assert index.large_countries() == [("India", 1380004385)]
+    assert index.large_countries("Europe", 10000000) == [("Spain", 47351567)]
+    assert index.large_countries("Oceania") == []
+
+@pytest.mark.query
+def test_currencies_in_region(index):
+    assert index.currencies_in_region("Europe") == {("Euro", "€")}
+    assert index.currencies_in_region("Asia") == {("Indian rupee", "₹"), ("Bhutanese ngultrum", "Nu.")}
+
+@pytest.mark.query
+def test_multi_currency_countries(index):
+    assert index.multi_currency_countries() == [("Bhutan", "Asia", 2)]
+
+@pytest.mark.query
+def test_population_between(index):
+    assert index.population_between(1000000, 50000000) == ["IE", "ES"]
+    # Antarctica has no population, so it never matches a population range
+    assert index.population_between(max_population=1000000) == ["BT"]
+    assert index.population_between(min_population=-1) == ["BT", "IE", "ES", "IN"]
+    assert index.filter(max_population=10) == []
+    assert index.group_by("region", max_population=1000000) == {"Asia": 1}
+
+@pytest.mark.query
+def test_filter(index):
+    assert sorted(index.filter(language="eng")) == ["IE", "IN"]
+    assert index.filter(language="eng", region="Europe") == ["IE"]
+    assert index.filter(currency="INR", min_population=1000000) == ["IN"]
+    assert index.filter(currency="XXX") == []
+    assert len(index.filter()) == 5
+
+@pytest.mark.query
+def test_group_by(index):
+    assert index.group_by("region") == {"Asia": 2, "Europe": 2, "Antarctic": 1}
+    assert index.group_by("currency", agg="sum", region="Asia") == {"INR": 1380775997, "BTN": 771612}
+    assert index.group_by("language", agg="max", value="area", region="Europe") == {
+        "spa": 505992.0, "eng": 70273.0, "gle": 70273.0
+    }
+    assert index.group_by("region", agg="avg", region="Antarctic") == {"Antarctic": None}
+
+@pytest.mark.query
+def test_group_by_invalid(index):
+    with pytest.raises(ValueError):
+        index.group_by("capital")
+    with pytest.raises(ValueError):
+        index.group_by("region", agg="median")
+    with pytest.raises(ValueError):
+        index.group_by("region", agg="count", value="name")
@@ -0,0 +1,112 @@
+# tests/test_validate.py
+import csv
+import pytest
+from etl.validate import validate_transformed_data, write_rejected_report
+
+@pytest.fixture
+def transformed_data():
+    return {
+        "countries": [
+            {"cca2": "US", "name": "United States", "capital": "Washington, D.C.", "region": "Americas",
+             "subregion": "North America", "population": 331000000, "area": 9833517.0},
+            {"cca2": "TOOLONG", "name": "Bad Code", "capital": None, "region": None,
+             "subregion": None, "population": 1000, "area": 10.0},
+            {"cca2": "XX", "name": "Negative", "capital": None, "region": None,
+             "subregion": None, "population": -5, "area": "big"},
+            {"cca2": "AQ", "name": "Antarctica", "capital": None, "region": "Antarctic",
+             "subregion": None, "population": 0, "area": 14000000}
+        ],
+        "currencies": [
+            {"code": "USD", "name": "US Dollar", "symbol": "$"},
+            {"code": "BAD", "name": "", "symbol": None}
+        ],
+        "languages": [
+            {"code": "en", "name": "English"}
+        ],
+        "country_currency": [
+            {"country_cca2": "US", "currency_code": "USD"},
+            {"country_cca2": "US", "currency_code": "BAD"},
+            {"country_cca2": "XX", "currency_code": "USD"}
+        ],
+        "country_language": [
+            {"country_cca2": "US", "language_code": "en"},
+            {"country_cca2": "TOOLONG", "language_code": "en"}
+        ]
+    }
+
+@pytest.mark.validate
+def test_validate_rejects_bad_rows(transformed_data):
+    valid, rejected = validate_transformed_data(transformed_data)
+
+    assert [c["cca2"] for c in valid["countries"]] == ["US", "AQ"]
+    assert valid["currencies"] == [{"code": "USD", "name": "US Dollar", "symbol": "$"}]
+    assert valid["languages"] == transformed_data["languages"]
+    assert valid["country_currency"] == [{"country_cca2": "US", "currency_code": "USD"}]
+    assert valid["country_language"] == [{"country_cca2": "US", "language_code": "en"}]
+
+    assert [(r["table"], r["key"], r["rule"]) for r in rejected] == [
+        ("countries", "TOOLONG", "cca2_format"),
+        ("countries", "XX", "population_non_negative_integer"),
+        ("countries", "XX", "area_non_negative_number"),
+        ("currencies", "BAD", "name_required")
+    ]
+
+@pytest.mark.validate
+@pytest.mark.parametrize(
+    "column, value",
+    [
+        ("cca2", None),
+        ("cca2", ""),
+        ("name", None),
+        ("population", 1.5),
+        ("population", True),
+        ("population", 2 ** 63),
+        ("area", float("nan")),
+        ("area", -1.0),
+        ("capital", "x" * 256)
+    ]
+)
+def test_validate_country_rules(column, value):
+    country = {"cca2": "XX", "name": "Test Country", "capital": None, "region": None,
+               "subregion": None, "population": 1000, "area": 1000.0}
+    country[column] = value
+    data = {"countries": [country], "currencies": [], "languages": [], "country_currency": [], "country_language": []}
+
+    valid, rejected = validate_transformed_data(data)
+    assert valid["countries"] == []
+    assert rejected[0]["column"] == column
+
+@pytest.mark.validate
+def test_validate_keeps_clean_data():
+    data = {
+        "countries": [{"cca2": "ES", "name": "Spain", "capital": "Madrid", "region": "Europe",
+                       "subregion": "Southern Europe", "population": 47350000, "area": 505990.0}],
+        "currencies": [{"code": "EUR", "name": "Euro", "symbol": "€"}],
+        "languages": [{"code": "es", "name": "Spanish"}],
+        "country_currency": [{"country_cca2": "ES", "currency_code": "EUR"}],
+        "country_language": [{"country_cca2": "ES", "language_code": "es"}]
+    }
+    valid, rejected = validate_transformed_data(data)
+    assert valid == data
+    assert rejected == []
+
+@pytest.mark.validate
+def test_write_rejected_report(transformed_data, tmp_path):
+    _, rejected = validate_transformed_data(transformed_data)
+    path = tmp_path / "reports" / "rejected.csv"
+    write_rejected_report(rejected, str(path))
+
+    with open(path, newline="", encoding="utf-8") as report:
+        rows = list(csv.DictReader(report))
+    assert len(rows) == 4
+    assert rows[2] == {"table": "countries", "key": "XX", "column": "area", "rule": "area_non_negative_number", "value": "big"}
+
+@pytest.mark.validate
+def test_write_rejected_report_replaces_previous(transformed_data, tmp_path):
+    path = tmp_path / "rejected.csv"
+    _, rejected = validate_transformed_data(transformed_data)
+    write_rejected_report(rejected, str(path))
+
+    # A clean run leaves a header-only report
+    write_rejected_report([], str(path))
+    assert path.read_text(encoding="utf-8").splitlines() == ["table,key,column,rule,value"]